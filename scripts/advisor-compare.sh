@@ -68,9 +68,14 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 # Auto-detect previous date if not specified
 if [[ -z "$PREVIOUS_DATE" ]]; then
   RAW_PATH="${CACHE_DIR}/raw/${APPID}"
-  if [[ -d "$RAW_PATH" ]]; then
-    PREVIOUS_DATE=$(find "$RAW_PATH" -mindepth 1 -maxdepth 1 -type d -exec basename {} \; | grep -v "$CURRENT_DATE" | sort -r | head -1)
-  fi
+  for DATE_DIR in "$RAW_PATH"/*/; do
+    [[ -d "$DATE_DIR" ]] || continue
+    DATE_DIR="${DATE_DIR%/}"
+    DATE_DIR="${DATE_DIR##*/}"
+    if [[ "$DATE_DIR" != "$CURRENT_DATE" && "$DATE_DIR" > "$PREVIOUS_DATE" ]]; then
+      PREVIOUS_DATE="$DATE_DIR"
+    fi
+  done
 fi
 
 if [[ -z "$PREVIOUS_DATE" ]]; then
@@ -83,71 +88,107 @@ echo "   Account: ${APPID}"
 echo "   Architecture: ${ARCHITECTURE}"
 echo ""
 
-# Generate reports for comparison
-CURRENT_REPORT=$(mktemp)
-PREVIOUS_REPORT=$(mktemp)
-
-python3 "${SCRIPT_DIR}/generate-report.py" \
-  --appid "$APPID" \
-  --date "$CURRENT_DATE" \
-  --architecture "$ARCHITECTURE" \
-  --cache-dir "$CACHE_DIR" \
-  --output-format json \
-  --output-file "$CURRENT_REPORT"
+COMPARE_DIR="${CACHE_DIR}/compare/${APPID}/${ARCHITECTURE}"
+DIFF_FILE="${COMPARE_DIR}/diff.json"
+mkdir -p "$COMPARE_DIR"
+
+# Reuse the cached comparison when it covers the same two dates and
+# nothing has been cached for either of them since it was written
+REUSE_DIFF=false
+if [[ -f "$DIFF_FILE" ]] && jq -e --arg c "$CURRENT_DATE" --arg p "$PREVIOUS_DATE" \
+    '.current == $c and .previous == $p' "$DIFF_FILE" > /dev/null 2>&1; then
+  NEWER_INPUT=$(find "${CACHE_DIR}/raw/${APPID}/${CURRENT_DATE}/${ARCHITECTURE}" \
+    "${CACHE_DIR}/raw/${APPID}/${PREVIOUS_DATE}/${ARCHITECTURE}" \
+    -newer "$DIFF_FILE" -print -quit 2>/dev/null || true)
+  [[ -z "$NEWER_INPUT" ]] && REUSE_DIFF=true
+fi
 
-python3 "${SCRIPT_DIR}/generate-report.py" \
-  --appid "$APPID" \
-  --date "$PREVIOUS_DATE" \
-  --architecture "$ARCHITECTURE" \
-  --cache-dir "$CACHE_DIR" \
-  --output-format json \
-  --output-file "$PREVIOUS_REPORT"
+if [[ "$REUSE_DIFF" == true ]]; then
+  echo "♻️  Inputs unchanged, reusing cached comparison"
+  echo ""
+else
+  # Generate both reports concurrently; they write to separate date
+  # directories, and their logs are replayed in order once both finish
+  CURRENT_REPORT=$(mktemp)
+  PREVIOUS_REPORT=$(mktemp)
+  CURRENT_LOG=$(mktemp)
+  PREVIOUS_LOG=$(mktemp)
+  
+  "${SCRIPT_DIR}/generate-report.sh" \
+    --appid "$APPID" \
+    --date "$CURRENT_DATE" \
+    --architecture "$ARCHITECTURE" \
+    --cache-dir "$CACHE_DIR" \
+    --output-format json \
+    --output-file "$CURRENT_REPORT" \
+    > "$CURRENT_LOG" 2>&1 &
+  CURRENT_PID=$!
+  
+  "${SCRIPT_DIR}/generate-report.sh" \
+    --appid "$APPID" \
+    --date "$PREVIOUS_DATE" \
+    --architecture "$ARCHITECTURE" \
+    --cache-dir "$CACHE_DIR" \
+    --output-format json \
+    --output-file "$PREVIOUS_REPORT" \
+    > "$PREVIOUS_LOG" 2>&1 &
+  PREVIOUS_PID=$!
+  
+  GENERATE_STATUS=0
+  wait "$CURRENT_PID" || GENERATE_STATUS=$?
+  wait "$PREVIOUS_PID" || GENERATE_STATUS=$?
+  cat "$CURRENT_LOG" "$PREVIOUS_LOG"
+  rm -f "$CURRENT_LOG" "$PREVIOUS_LOG"
+  if [[ $GENERATE_STATUS -ne 0 ]]; then
+    rm -f "$CURRENT_REPORT" "$PREVIOUS_REPORT"
+    exit "$GENERATE_STATUS"
+  fi
+  
+  # Compute every metric delta in a single jq pass over both reports and
+  # keep the result in the compare cache; temp files are renamed into
+  # place so a partial write is never picked up
+  jq -n \
+    --slurpfile current "$CURRENT_REPORT" \
+    --slurpfile previous "$PREVIOUS_REPORT" \
+    --arg current_date "$CURRENT_DATE" \
+    --arg previous_date "$PREVIOUS_DATE" '
+    ($current[0].reports[0].xlsx_data.summary // {}) as $curr
+    | ($previous[0].reports[0].xlsx_data.summary // {}) as $prev
+    | {
+        current: $current_date,
+        previous: $previous_date,
+        metrics: [
+          ["高风险", "high_risk", "🔴"],
+          ["中风险", "medium_risk", "🟡"],
+          ["低风险", "low_risk", "🟢"],
+          ["健康", "healthy", "✅"]
+          | . as [$name, $key, $emoji]
+          | {name: $name, key: $key, emoji: $emoji,
+             previous: ($prev[$key] // 0), current: ($curr[$key] // 0)}
+          | .diff = .current - .previous
+        ]
+      }' > "${DIFF_FILE}.tmp"
+  mv "${DIFF_FILE}.tmp" "$DIFF_FILE"
+  echo "$PREVIOUS_DATE" > "${COMPARE_DIR}/prev-date.txt.tmp"
+  mv "${COMPARE_DIR}/prev-date.txt.tmp" "${COMPARE_DIR}/prev-date.txt"
+  
+  # Cleanup
+  rm -f "$CURRENT_REPORT" "$PREVIOUS_REPORT"
+fi
 
 # Display comparison
 echo "📈 Comparison Results:"
 echo ""
 
-# Use Python to do the comparison logic
-python3 << EOF
-import json
-import sys
-
-with open("$CURRENT_REPORT", 'r') as f:
-    current = json.load(f)
-
-with open("$PREVIOUS_REPORT", 'r') as f:
-    previous = json.load(f)
-
-def get_summary(data):
-    reports = data.get("reports", [])
-    if reports:
-        return reports[0].get("xlsx_data", {}).get("summary", {})
-    return {}
-
-curr_sum = get_summary(current)
-prev_sum = get_summary(previous)
-
-print(f"{'指标':<15} {'上期':>8} {'本期':>8} {'变化':>8}")
-print("-" * 42)
-
-metrics = [
-    ("高风险", "high_risk", "🔴"),
-    ("中风险", "medium_risk", "🟡"),
-    ("低风险", "low_risk", "🟢"),
-    ("健康", "healthy", "✅"),
-]
-
-for label, key, emoji in metrics:
-    c = curr_sum.get(key, 0)
-    p = prev_sum.get(key, 0)
-    diff = c - p
-    trend = "↑" if diff > 0 else ("↓" if diff < 0 else "→")
-    print(f"{emoji} {label:<12} {p:>8} {c:>8} {trend}{abs(diff):>6}")
-
-EOF
-
-# Cleanup
-rm -f "$CURRENT_REPORT" "$PREVIOUS_REPORT"
+jq -r '
+  def rpad($n): tostring | if length < $n then . + " " * ($n - length) else . end;
+  def lpad($n): tostring | if length < $n then " " * ($n - length) + . else . end;
+  ("指标" | rpad(15)) + " " + ("上期" | lpad(8)) + " " + ("本期" | lpad(8)) + " " + ("变化" | lpad(8)),
+  "-" * 42,
+  ( .metrics[]
+    | (if .diff > 0 then "↑" elif .diff < 0 then "↓" else "→" end) as $trend
+    | "\(.emoji) \(.name | rpad(12)) \(.previous | lpad(8)) \(.current | lpad(8)) \($trend)\(if .diff < 0 then -.diff else .diff end | lpad(6))"
+  )' "$DIFF_FILE"
 
 echo ""
 echo "✅ Comparison complete"
@@ -15,6 +15,7 @@ ARCHITECTURE=""
 COMPARE=false
 FORCE=false
 TODAY=false
+JOBS=4
 
 # Colors for terminal output
 RED='\033[0;31m'
@@ -59,6 +60,10 @@ while [[ $# -gt 0 ]]; do
       CACHE_DIR="$2"
       shift 2
       ;;
+    --jobs)
+      JOBS="$2"
+      shift 2
+      ;;
     --help|-h)
       echo "Usage: $0 [OPTIONS]"
       echo ""
@@ -71,6 +76,7 @@ while [[ $# -gt 0 ]]; do
       echo "  --force              Ignore cache, re-fetch all emails"
       echo "  --output FORMAT      Output format: markdown|json|terminal"
       echo "  --cache-dir PATH     Cache directory (default: ~/.advisor)"
+      echo "  --jobs N             Reports generated in parallel (default: 4)"
       echo "  --help               Show this help message"
       exit 0
       ;;
@@ -87,6 +93,11 @@ if [[ -z "$DATE" && "$TODAY" == false ]]; then
   exit 1
 fi
 
+if [[ ! "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+  echo "Error: --jobs must be a positive integer"
+  exit 1
+fi
+
 # Check dependencies
 check_deps() {
   local missing=()
@@ -139,8 +150,13 @@ echo -e "${BLUE}📊 Generating reports...${NC}"
 if [[ -n "$APPID" ]]; then
   ACCOUNTS="$APPID"
 else
-  # Find all accounts with data for the date
-  ACCOUNTS=$(find "${CACHE_DIR}/raw" -mindepth 1 -maxdepth 1 -type d -exec basename {} \; 2>/dev/null | sort -u)
+  # Find all accounts with data for the date; the glob expands sorted
+  ACCOUNTS=""
+  for ACCOUNT_DIR in "${CACHE_DIR}/raw"/*/; do
+    [[ -d "$ACCOUNT_DIR" ]] || continue
+    ACCOUNT_DIR="${ACCOUNT_DIR%/}"
+    ACCOUNTS+="${ACCOUNT_DIR##*/} "
+  done
 fi
 
 if [[ -z "$ACCOUNTS" ]]; then
@@ -148,15 +164,29 @@ if [[ -z "$ACCOUNTS" ]]; then
   exit 0
 fi
 
-# Generate report for each account
+# Load account name mappings once for every account below
+source "${SCRIPT_DIR}/lib/accounts.sh"
+load_account_names "${CACHE_DIR}/accounts.json"
+
+# Options shared by every generator run, resolved once. Generators already
+# run $JOBS at a time, so each parses its workbooks one by one to keep the
+# total number of processes at $JOBS.
+GENERATE_ARGS=(--date "$DATE" --cache-dir "$CACHE_DIR" --output-format "$OUTPUT_FORMAT" --jobs 1)
+[[ "$COMPARE" == true ]] && GENERATE_ARGS+=(--compare)
+
+# Generate report for each account, up to $JOBS architectures at a time.
+# Each generator writes to its own log, headed by its progress lines and
+# replayed in order once all finish.
+LOG_DIR=$(mktemp -d)
+JOB_LOGS=()
+JOB_PIDS=()
+WAITED=0
+FAILED=0
 for AID in $ACCOUNTS; do
-  echo -e "${GREEN}📋 Processing account: ${AID}${NC}"
+  ACCOUNT_HEADER="${GREEN}📋 Processing account: ${AID}${NC}"
   
   # Get account name from mapping
-  ACCOUNT_NAME=""
-  if [[ -f "${CACHE_DIR}/accounts.json" ]]; then
-    ACCOUNT_NAME=$(jq -r ".[\"${AID}\"] // empty" "${CACHE_DIR}/accounts.json" 2>/dev/null)
-  fi
+  lookup_account_name "$AID"
   
   # Find architectures for this account
   if [[ -n "$ARCHITECTURE" ]]; then
@@ -165,26 +195,60 @@ for AID in $ACCOUNTS; do
     # Find all architectures with data
     ARCH_DIR="${CACHE_DIR}/raw/${AID}/${DATE}"
     if [[ -d "$ARCH_DIR" ]]; then
-      ARCHES=$(find "$ARCH_DIR" -mindepth 1 -maxdepth 1 -type d -exec basename {} \; 2>/dev/null | sort -u)
+      ARCHES=""
+      for ARCH_PATH in "$ARCH_DIR"/*/; do
+        [[ -d "$ARCH_PATH" ]] || continue
+        ARCH_PATH="${ARCH_PATH%/}"
+        ARCHES+="${ARCH_PATH##*/} "
+      done
     else
       ARCHES="default"
     fi
   fi
   
   for ARCH in $ARCHES; do
-    echo -e "${BLUE}  └─ Architecture: ${ARCH}${NC}"
+    # Throttle: wait for the oldest running generator (FIFO, bash 3 has
+    # no wait -n); WAITED counts the PIDs already reaped
+    while [[ $((${#JOB_PIDS[@]} - WAITED)) -ge $JOBS ]]; do
+      wait "${JOB_PIDS[$WAITED]}" || FAILED=$((FAILED + 1))
+      WAITED=$((WAITED + 1))
+    done
     
     # Generate report using shell script
+    LOG_FILE="${LOG_DIR}/${#JOB_LOGS[@]}.log"
+    JOB_LOGS+=("$LOG_FILE")
+    {
+      [[ -n "$ACCOUNT_HEADER" ]] && echo -e "$ACCOUNT_HEADER"
+      echo -e "${BLUE}  └─ Architecture: ${ARCH}${NC}"
+    } > "$LOG_FILE"
+    ACCOUNT_HEADER=""
     "${SCRIPT_DIR}/generate-report.sh" \
       --appid "$AID" \
       --account-name "$ACCOUNT_NAME" \
-      --date "$DATE" \
       --architecture "$ARCH" \
-      --cache-dir "$CACHE_DIR" \
-      --output-format "$OUTPUT_FORMAT" \
-      $(if [[ "$COMPARE" == true ]]; then echo "--compare"; fi)
+      "${GENERATE_ARGS[@]}" \
+      >> "$LOG_FILE" 2>&1 &
+    JOB_PIDS+=($!)
   done
+  
+  # An account without architectures still gets its header
+  if [[ -n "$ACCOUNT_HEADER" ]]; then
+    LOG_FILE="${LOG_DIR}/${#JOB_LOGS[@]}.log"
+    JOB_LOGS+=("$LOG_FILE")
+    echo -e "$ACCOUNT_HEADER" > "$LOG_FILE"
+  fi
+done
+
+for PID in "${JOB_PIDS[@]:$WAITED}"; do
+  wait "$PID" || FAILED=$((FAILED + 1))
 done
+[[ ${#JOB_LOGS[@]} -gt 0 ]] && cat "${JOB_LOGS[@]}"
+rm -rf "$LOG_DIR"
+
+if [[ $FAILED -gt 0 ]]; then
+  echo -e "${RED}Error: ${FAILED} report(s) failed to generate${NC}"
+  exit 1
+fi
 
 echo -e "${GREEN}✅ Report generation complete${NC}"
 
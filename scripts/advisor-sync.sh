@@ -10,6 +10,24 @@ CACHE_DIR="${HOME}/.advisor"
 SINCE_HOURS=24
 DRY_RUN=false
 PRUNE_DAYS=0
+PAGE_SIZE=100
+
+# Subject patterns, shared by every email in the loop
+# Subject format: 腾讯云智能顾问(TSA)-[报告类型]-[架构名]
+ADVISOR_SUBJECT="腾讯云智能顾问"
+REPORT_TYPE_RE='(架构风险治理报告|日常巡检报告|架构负载报告|告警)'
+ARCHITECTURE_RE='-([a-zA-Z0-9_-]+)$'
+
+# Content patterns; a value runs to the end of its line or the next tag.
+# Metadata sits at the top of the email, so only a bounded prefix is scanned.
+MAX_SCAN_CHARS=65536
+NL=$'\n'
+APPID_RE="APPID[^0-9${NL}]*([0-9]+)"
+ACCOUNT_NAME_RE="账号名称[[:blank:]]*(：|:)[[:blank:]]*([^<${NL}]+)"
+# Fallback when there is no 账号名称 label: some line mentions 名称 then
+# 腾讯, and the first 名称 value in the email is taken
+TENCENT_LINE_RE="名称[^${NL}]*腾讯"
+NAME_RE="名称[[:blank:]]*(：|:)[[:blank:]]*([^<${NL}]+)"
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -30,6 +48,10 @@ while [[ $# -gt 0 ]]; do
       PRUNE_DAYS="$2"
       shift 2
       ;;
+    --page-size)
+      PAGE_SIZE="$2"
+      shift 2
+      ;;
     --help|-h)
       echo "Usage: $0 [OPTIONS]"
       echo ""
@@ -38,6 +60,7 @@ while [[ $# -gt 0 ]]; do
       echo "  --cache-dir PATH     Cache directory (default: ~/.advisor)"
       echo "  --dry-run            Show what would be synced without downloading"
       echo "  --prune-days N       Remove cache entries older than N days"
+      echo "  --page-size N        Envelopes listed per request (default: 100)"
       echo "  --help               Show this help message"
       exit 0
       ;;
@@ -48,6 +71,11 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+if [[ ! "$PAGE_SIZE" =~ ^[1-9][0-9]*$ ]]; then
+  echo "Error: --page-size must be a positive integer"
+  exit 1
+fi
+
 # Ensure cache structure exists
 mkdir -p "${CACHE_DIR}"/{raw,reports,compare}
 
@@ -57,13 +85,28 @@ if [[ ! -f "$INDEX_FILE" ]]; then
   echo '{"version":"1.0","lastSync":null,"emails":{}}' > "$INDEX_FILE"
 fi
 
+# Load cached message IDs once, newline-delimited, so dedup is a string
+# match per email instead of a jq run (bash 3 has no associative arrays)
+CACHED_IDS=$(jq -r '.emails | keys[]' "$INDEX_FILE")
+
 # Calculate since date
 SINCE_DATE=$(date -u -d "${SINCE_HOURS} hours ago" +%Y-%m-%d 2>/dev/null || date -v-${SINCE_HOURS}H -u +%Y-%m-%d)
 
+# Retention cutoff: emails dated before it are neither cached nor indexed
+PRUNE_BEFORE=""
+if [[ $PRUNE_DAYS -gt 0 ]]; then
+  PRUNE_BEFORE=$(date -u -d "${PRUNE_DAYS} days ago" +%Y-%m-%d 2>/dev/null || date -v-${PRUNE_DAYS}d -u +%Y-%m-%d)
+fi
+
 echo "🔍 Fetching emails since ${SINCE_DATE}..."
 
-# Fetch emails from Tencent Smart Advisor
-EMAILS_JSON=$(himalaya envelope list from:email@advisor.cloud.tencent.com --output json 2>/dev/null | jq -c '.')
+# Fetch emails from Tencent Smart Advisor, one page large enough for the
+# whole window instead of the client's small default page; the server
+# drops mail older than the window so it is never listed or triaged
+EMAILS_JSON=$(himalaya envelope list --page-size "$PAGE_SIZE" \
+  from:email@advisor.cloud.tencent.com \
+  since:"$SINCE_DATE" \
+  --output json 2>/dev/null | jq -c '.')
 
 if [[ -z "$EMAILS_JSON" || "$EMAILS_JSON" == "null" ]]; then
   echo "⚠️ No emails found"
@@ -73,81 +116,109 @@ fi
 # Count emails
 EMAIL_COUNT=$(echo "$EMAILS_JSON" | jq 'length')
 echo "📧 Found ${EMAIL_COUNT} emails"
+if [[ $EMAIL_COUNT -ge $PAGE_SIZE ]]; then
+  echo "⚠️ Listing filled --page-size (${PAGE_SIZE}); older emails in the window may be missing, rerun with a larger --page-size"
+fi
+
+# New index entries are appended here as JSON lines and merged at the end
+NEW_ENTRIES=$(mktemp)
+MERGE_NEW_ENTRIES='.emails += ($new | map({key: .messageId, value: {subject, appId, reportType, architecture, date: (.date | split(" ")[0]), cachedAt}}) | from_entries)'
+
+# If the run aborts midway, still index the emails cached so far, then
+# drop the log; after a normal merge the log is already gone
+merge_pending_entries() {
+  if [[ -s "$NEW_ENTRIES" ]]; then
+    local tmp_index
+    tmp_index=$(mktemp)
+    if jq --slurpfile new "$NEW_ENTRIES" "$MERGE_NEW_ENTRIES" "$INDEX_FILE" > "$tmp_index" 2>/dev/null; then
+      mv "$tmp_index" "$INDEX_FILE"
+    else
+      rm -f "$tmp_index"
+    fi
+  fi
+  rm -f "$NEW_ENTRIES"
+}
+trap merge_pending_entries EXIT
 
-# Process each email
-echo "$EMAILS_JSON" | jq -c '.[]' | while read -r email; do
-  MSG_ID=$(echo "$email" | jq -r '.id')
-  SUBJECT=$(echo "$email" | jq -r '.subject')
-  DATE_STR=$(echo "$email" | jq -r '.date')
-  HAS_ATTACH=$(echo "$email" | jq -r '.has_attachment')
+# Process each Advisor email inside the retention window (others are
+# filtered out in the same jq pass)
+# Fields arrive as one unit-separator delimited row per email
+echo "$EMAILS_JSON" | jq -r --arg marker "$ADVISOR_SUBJECT" --arg before "$PRUNE_BEFORE" \
+  '.[] | select((.subject // "") | contains($marker))
+   | select((.date // "") >= $before)
+   | [.id, .subject, .date, .has_attachment] | map(tostring) | join("\u001f")' |
+while IFS=$'\x1f' read -r MSG_ID SUBJECT DATE_STR HAS_ATTACH; do
+  # Triage on envelope fields alone; only uncached emails are parsed and read
+  if [[ "$DRY_RUN" == false ]]; then
+    case $'\n'"$CACHED_IDS"$'\n' in
+      *$'\n'"$MSG_ID"$'\n'*)
+        echo "  ⏭️  Skipping ${MSG_ID} (already cached)"
+        continue
+        ;;
+    esac
+  fi
   
-  # Skip non-Advisor emails
-  if [[ ! "$SUBJECT" =~ "腾讯云智能顾问" ]]; then
+  if [[ "$DRY_RUN" == true ]]; then
+    echo "  [DRY-RUN] Would sync: ${SUBJECT}"
     continue
   fi
   
   # Parse subject to extract metadata
-  # Subject format: 腾讯云智能顾问(TSA)-[报告类型]-[架构名]
   REPORT_TYPE=""
   ARCHITECTURE=""
   
-  if [[ "$SUBJECT" =~ "架构风险治理报告" ]]; then
-    REPORT_TYPE="risk"
-  elif [[ "$SUBJECT" =~ "日常巡检报告" ]]; then
-    REPORT_TYPE="inspection"
-  elif [[ "$SUBJECT" =~ "架构负载报告" ]]; then
-    REPORT_TYPE="capacity"
-  elif [[ "$SUBJECT" =~ "告警" ]]; then
-    REPORT_TYPE="alert"
+  # One alternation match, then map the hit to its report type
+  if [[ "$SUBJECT" =~ $REPORT_TYPE_RE ]]; then
+    case "${BASH_REMATCH[1]}" in
+      架构风险治理报告) REPORT_TYPE="risk" ;;
+      日常巡检报告) REPORT_TYPE="inspection" ;;
+      架构负载报告) REPORT_TYPE="capacity" ;;
+      告警) REPORT_TYPE="alert" ;;
+    esac
   else
     REPORT_TYPE="other"
   fi
   
   # Extract architecture name from subject
-  if [[ "$SUBJECT" =~ -([a-zA-Z0-9_-]+)$ ]]; then
+  if [[ "$SUBJECT" =~ $ARCHITECTURE_RE ]]; then
     ARCHITECTURE="${BASH_REMATCH[1]}"
   else
     ARCHITECTURE="default"
   fi
   
   # Parse date
-  EMAIL_DATE=$(echo "$DATE_STR" | cut -d' ' -f1)
-  
-  # Check if already cached (by message ID)
-  ALREADY_CACHED=$(jq -r ".emails[\"${MSG_ID}\"] | if . == null then false else true end" "$INDEX_FILE")
-  
-  if [[ "$ALREADY_CACHED" == "true" && "$DRY_RUN" == false ]]; then
-    echo "  ⏭️  Skipping ${MSG_ID} (already cached)"
-    continue
-  fi
-  
-  if [[ "$DRY_RUN" == true ]]; then
-    echo "  [DRY-RUN] Would sync: ${SUBJECT}"
-    continue
-  fi
+  EMAIL_DATE="${DATE_STR%% *}"
   
   echo "  📥 Processing: ${SUBJECT}"
   
   # Fetch full email content to extract APPID
   EMAIL_CONTENT=$(himalaya message read "$MSG_ID" 2>/dev/null || true)
   
+  SCAN_CONTENT="${EMAIL_CONTENT:0:MAX_SCAN_CHARS}"
+  
   # Extract APPID from content
-  APPID=$(echo "$EMAIL_CONTENT" | grep -oE 'APPID[^0-9]*[0-9]+' | grep -oE '[0-9]+' | head -1)
-  if [[ -z "$APPID" ]]; then
-    APPID=$(echo "$EMAIL_CONTENT" | grep -oE '1312346585' | head -1)
-  fi
-  if [[ -z "$APPID" ]]; then
+  if [[ "$SCAN_CONTENT" =~ $APPID_RE ]]; then
+    APPID="${BASH_REMATCH[1]}"
+  elif [[ "$SCAN_CONTENT" == *1312346585* ]]; then
+    APPID="1312346585"
+  else
     APPID="unknown"
   fi
   
   # Extract account name from content (for accounts.json auto-update)
+  # The 账号名称 label takes precedence; without it, fall back to a
+  # 名称 value only when the email mentions 腾讯 after a 名称 label
   ACCOUNT_NAME=""
-  # Try different patterns for account name
-  if echo "$EMAIL_CONTENT" | grep -q '账号名称'; then
-    ACCOUNT_NAME=$(echo "$EMAIL_CONTENT" | grep -oP '账号名称\s*[：:]\s*\K[^<\n]+' | head -1 | sed 's/[[:space:]]*$//')
-  elif echo "$EMAIL_CONTENT" | grep -q '名称.*腾讯'; then
-    ACCOUNT_NAME=$(echo "$EMAIL_CONTENT" | grep -oP '名称\s*[：:]\s*\K[^<\n]+' | head -1 | sed 's/[[:space:]]*$//')
+  if [[ "$SCAN_CONTENT" == *账号名称* ]]; then
+    if [[ "$SCAN_CONTENT" =~ $ACCOUNT_NAME_RE ]]; then
+      ACCOUNT_NAME="${BASH_REMATCH[2]}"
+    fi
+  elif [[ "$SCAN_CONTENT" =~ $TENCENT_LINE_RE ]]; then
+    if [[ "$SCAN_CONTENT" =~ $NAME_RE ]]; then
+      ACCOUNT_NAME="${BASH_REMATCH[2]}"
+    fi
   fi
+  ACCOUNT_NAME="${ACCOUNT_NAME%"${ACCOUNT_NAME##*[![:space:]]}"}"
   
   # Update accounts.json if we found a name and APPID is not already present
   if [[ -n "$ACCOUNT_NAME" && "$APPID" != "unknown" ]]; then
@@ -156,10 +227,10 @@ echo "$EMAILS_JSON" | jq -c '.[]' | while read -r email; do
       echo "{}" > "$ACCOUNTS_FILE"
     fi
     # Only add if not already exists (preserve manual edits)
-    CURRENT_NAME=$(jq -r ".[\"${APPID}\"] // empty" "$ACCOUNTS_FILE" 2>/dev/null)
+    CURRENT_NAME=$(jq -r --arg id "$APPID" '.[$id] // empty' "$ACCOUNTS_FILE" 2>/dev/null)
     if [[ -z "$CURRENT_NAME" ]]; then
       TMP_ACCOUNTS=$(mktemp)
-      jq ".[\"${APPID}\"] = \"${ACCOUNT_NAME}\"" "$ACCOUNTS_FILE" > "$TMP_ACCOUNTS"
+      jq --arg id "$APPID" --arg name "$ACCOUNT_NAME" '.[$id] = $name' "$ACCOUNTS_FILE" > "$TMP_ACCOUNTS"
       mv "$TMP_ACCOUNTS" "$ACCOUNTS_FILE"
       echo "     └─ Updated accounts.json: ${APPID} -> ${ACCOUNT_NAME}"
     fi
@@ -169,9 +240,19 @@ echo "$EMAILS_JSON" | jq -c '.[]' | while read -r email; do
   CACHE_PATH="${CACHE_DIR}/raw/${APPID}/${EMAIL_DATE}/${ARCHITECTURE}"
   mkdir -p "$CACHE_PATH/attachments"
   
-  # Save email metadata
+  # Save email metadata; the index entry is derived from it
   META_FILE="${CACHE_PATH}/${MSG_ID}-meta.json"
-  echo "{\"messageId\":\"${MSG_ID}\",\"subject\":\"${SUBJECT}\",\"date\":\"${DATE_STR}\",\"appId\":\"${APPID}\",\"reportType\":\"${REPORT_TYPE}\",\"architecture\":\"${ARCHITECTURE}\",\"cachedAt\":\"$(date -Iseconds)\"}" > "$META_FILE"
+  CACHED_AT=$(date -Iseconds)
+  META_JSON=$(jq -nc \
+    --arg messageId "$MSG_ID" \
+    --arg subject "$SUBJECT" \
+    --arg date "$DATE_STR" \
+    --arg appId "$APPID" \
+    --arg reportType "$REPORT_TYPE" \
+    --arg architecture "$ARCHITECTURE" \
+    --arg cachedAt "$CACHED_AT" \
+    '$ARGS.named')
+  echo "$META_JSON" > "$META_FILE"
   
   # Save email content
   echo "$EMAIL_CONTENT" > "${CACHE_PATH}/${MSG_ID}-content.txt"
@@ -182,21 +263,26 @@ echo "$EMAILS_JSON" | jq -c '.[]' | while read -r email; do
     cd "${CACHE_PATH}/attachments" && himalaya attachment download "$MSG_ID" 2>/dev/null || true
   fi
   
-  # Update index
-  TMP_INDEX=$(mktemp)
-  jq ".emails[\"${MSG_ID}\"] = {\"subject\":\"${SUBJECT}\",\"appId\":\"${APPID}\",\"reportType\":\"${REPORT_TYPE}\",\"architecture\":\"${ARCHITECTURE}\",\"date\":\"${EMAIL_DATE}\",\"cachedAt\":\"$(date -Iseconds)\"}" "$INDEX_FILE" > "$TMP_INDEX"
-  mv "$TMP_INDEX" "$INDEX_FILE"
+  # Queue the index entry; the index itself is rewritten once after the loop
+  echo "$META_JSON" >> "$NEW_ENTRIES"
+  CACHED_IDS+=$'\n'"$MSG_ID"
 done
 
-# Update last sync timestamp
-TMP_INDEX=$(mktemp)
-jq ".lastSync = \"$(date -Iseconds)\"" "$INDEX_FILE" > "$TMP_INDEX"
-mv "$TMP_INDEX" "$INDEX_FILE"
-
 # Prune old cache if requested
 if [[ $PRUNE_DAYS -gt 0 ]]; then
   echo "🧹 Pruning cache older than ${PRUNE_DAYS} days..."
   find "${CACHE_DIR}/raw" -type d -mtime +$PRUNE_DAYS -exec rm -rf {} + 2>/dev/null || true
 fi
 
+# Merge this run's entries, update the last sync timestamp and keep the
+# index to the same rolling window as the cache, in a single rewrite
+TMP_INDEX=$(mktemp)
+jq --slurpfile new "$NEW_ENTRIES" --arg now "$(date -Iseconds)" --arg before "$PRUNE_BEFORE" \
+  "$MERGE_NEW_ENTRIES"'
+   | .lastSync = $now
+   | if $before != "" then .emails |= with_entries(select(.value.date >= $before)) else . end' \
+  "$INDEX_FILE" > "$TMP_INDEX"
+mv "$TMP_INDEX" "$INDEX_FILE"
+rm -f "$NEW_ENTRIES"
+
 echo "✅ Sync complete"
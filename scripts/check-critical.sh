@@ -21,40 +21,32 @@ check_critical() {
         exit 0
     fi
     
-    # Search for emails with critical keywords in subject
-    local critical_emails
-    critical_emails=$(himalaya envelope list \
+    # Search for emails with critical keywords in subject, and build the
+    # notification in the same jq pass; nothing is emitted when none match
+    local alert
+    alert=$(himalaya envelope list \
         from:"$SENDER" \
         since:"$since_date" \
         subject:"告警\|风险\|critical\|urgent" \
-        --output json 2>/dev/null | jq -c '.[]' || true)
-    
-    if [ -z "$critical_emails" ]; then
-        echo "HEARTBEAT_OK"
-        exit 0
-    fi
-    
-    # Count critical items
-    local count
-    count=$(echo "$critical_emails" | jq -s 'length')
-    
-    if [ "$count" -eq 0 ]; then
-        echo "HEARTBEAT_OK"
-        exit 0
-    fi
-    
-    # Output alert notification as JSON
-    echo "$critical_emails" | jq -s '{
+        --output json 2>/dev/null | jq 'select(type == "array" and length > 0) | {
         type: "tencent_advisor_alert",
         timestamp: now | todate,
-        summary: "检测到 \(. | length) 项需要关注的腾讯云智能顾问通知",
-        count: (. | length),
+        summary: "检测到 \(length) 项需要关注的腾讯云智能顾问通知",
+        count: length,
         items: [.[] | {
             id: .id,
             subject: .subject,
             date: .date
         }]
-    }'
+    }' || true)
+    
+    if [ -z "$alert" ]; then
+        echo "HEARTBEAT_OK"
+        exit 0
+    fi
+    
+    # Output alert notification as JSON
+    echo "$alert"
     
     # Return non-zero to indicate alert condition
     exit 1
@@ -45,95 +45,99 @@ if [[ $REPORT_COUNT -eq 0 ]]; then
   exit 0
 fi
 
-# Generate summary markdown
+# Load account name mappings once for every account/architecture below
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "${SCRIPT_DIR}/lib/accounts.sh"
+load_account_names "${CACHE_DIR}/accounts.json"
+
+# Generate summary markdown; each static section is written by a single
+# printf with one argument per line
+GENERATED_AT=$(date '+%Y-%m-%d %H:%M')
 {
-  echo "# 📊 腾讯云智能顾问日报 | ${DATE}"
-  echo ""
-  echo "> 📅 报告生成时间: $(date '+%Y-%m-%d %H:%M') (UTC+8)"
-  echo "> 📧 数据来源: 腾讯云智能顾问邮件订阅"
-  echo ""
-  echo "---"
-  echo ""
+  printf '%s\n' \
+    "# 📊 腾讯云智能顾问日报 | ${DATE}" \
+    "" \
+    "> 📅 报告生成时间: ${GENERATED_AT} (UTC+8)" \
+    "> 📧 数据来源: 腾讯云智能顾问邮件订阅" \
+    "" \
+    "---" \
+    ""
   
   # Aggregate summary
-  echo "## 一、总体概览"
-  echo ""
-  echo "| 统计项 | 数量 |"
-  echo "|--------|-----:|"
-  echo "| 🔴 高风险总数 | - |"
-  echo "| 🟡 中风险总数 | - |"
-  echo "| 🟢 低风险总数 | - |"
-  echo "| ✅ 健康资源 | - |"
-  echo ""
-  echo "---"
-  echo ""
+  printf '%s\n' \
+    "## 一、总体概览" \
+    "" \
+    "| 统计项 | 数量 |" \
+    "|--------|-----:|" \
+    "| 🔴 高风险总数 | - |" \
+    "| 🟡 中风险总数 | - |" \
+    "| 🟢 低风险总数 | - |" \
+    "| ✅ 健康资源 | - |" \
+    "" \
+    "---" \
+    ""
   
   # Per-account summary
-  echo "## 二、账号维度统计"
-  echo ""
+  printf '%s\n' "## 二、账号维度统计" ""
   
   # Find all accounts with reports for this date
   for ACCOUNT_DIR in "$REPORTS_DIR"/*; do
     [[ -d "$ACCOUNT_DIR" ]] || continue
-    APPID=$(basename "$ACCOUNT_DIR")
+    APPID="${ACCOUNT_DIR##*/}"
     
     # Find architectures
     DATE_DIR="${ACCOUNT_DIR}/${DATE}"
     [[ -d "$DATE_DIR" ]] || continue
     
+    # Get account name
+    lookup_account_name "$APPID"
+    ACCOUNT_NAME="${ACCOUNT_NAME:-$APPID}"
+    
     for ARCH_DIR in "$DATE_DIR"/*; do
       [[ -d "$ARCH_DIR" ]] || continue
-      ARCH=$(basename "$ARCH_DIR")
+      ARCH="${ARCH_DIR##*/}"
       
-      # Get account name
-      ACCOUNT_NAME="$APPID"
-      if [[ -f "${CACHE_DIR}/accounts.json" ]]; then
-        MAPPED=$(jq -r ".[\"${APPID}\"] // empty" "${CACHE_DIR}/accounts.json" 2>/dev/null)
-        [[ -n "$MAPPED" ]] && ACCOUNT_NAME="$MAPPED"
-      fi
-      
-      echo "### ${ACCOUNT_NAME} (${APPID})"
-      echo ""
+      printf '%s\n' "### ${ACCOUNT_NAME} (${APPID})" ""
       [[ "$ARCH" != "default" ]] && echo "**架构图**: ${ARCH}"
       echo ""
       
       # Include the report content if exists
       if [[ -f "${ARCH_DIR}/report.markdown" ]]; then
         cat "${ARCH_DIR}/report.markdown"
-        echo ""
-        echo "---"
-        echo ""
+        printf '%s\n' "" "---" ""
       fi
     done
   done
   
   # Action items
-  echo "## 三、待办事项汇总"
-  echo ""
-  echo "### 🔴 P0 - 立即处理（安全风险）"
-  echo ""
-  echo "- [ ] 审查所有高风险项目"
-  echo ""
-  echo "### 🟡 P1 - 本周处理（成本/性能优化）"
-  echo ""
-  echo "- [ ] 优化中风险配置项"
-  echo ""
-  echo "### 🟢 P2 - 计划内优化"
-  echo ""
-  echo "- [ ] 持续关注健康资源趋势"
-  echo ""
-  echo "---"
-  echo ""
+  printf '%s\n' \
+    "## 三、待办事项汇总" \
+    "" \
+    "### 🔴 P0 - 立即处理（安全风险）" \
+    "" \
+    "- [ ] 审查所有高风险项目" \
+    "" \
+    "### 🟡 P1 - 本周处理（成本/性能优化）" \
+    "" \
+    "- [ ] 优化中风险配置项" \
+    "" \
+    "### 🟢 P2 - 计划内优化" \
+    "" \
+    "- [ ] 持续关注健康资源趋势" \
+    "" \
+    "---" \
+    ""
   
   # Links
-  echo "## 四、控制台快捷链接"
-  echo ""
-  echo "| 产品 | 控制台 | 文档 |"
-  echo "|------|--------|------|"
-  echo "| 智能顾问 | [控制台](https://console.cloud.tencent.com/advisor) | [文档](https://cloud.tencent.com/product/advisor) |"
-  echo "| EdgeOne | [控制台](https://console.cloud.tencent.com/edgeone) | [文档](https://cloud.tencent.com/document/product/1552) |"
-  echo "| CVM | [控制台](https://console.cloud.tencent.com/cvm) | [文档](https://cloud.tencent.com/document/product/213) |"
-  echo ""
+  printf '%s\n' \
+    "## 四、控制台快捷链接" \
+    "" \
+    "| 产品 | 控制台 | 文档 |" \
+    "|------|--------|------|" \
+    "| 智能顾问 | [控制台](https://console.cloud.tencent.com/advisor) | [文档](https://cloud.tencent.com/product/advisor) |" \
+    "| EdgeOne | [控制台](https://console.cloud.tencent.com/edgeone) | [文档](https://cloud.tencent.com/document/product/1552) |" \
+    "| CVM | [控制台](https://console.cloud.tencent.com/cvm) | [文档](https://cloud.tencent.com/document/product/213) |" \
+    ""
   
 } > "${OUTPUT:-${REPORTS_DIR}/daily-summary-${DATE}.md}"
 
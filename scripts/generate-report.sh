@@ -15,6 +15,7 @@ ARCHITECTURE="default"
 ACCOUNT_NAME=""
 COMPARE=false
 OUTPUT_FILE=""
+JOBS=4
 
 # Colors
 BLUE='\033[0;34m'
@@ -33,6 +34,7 @@ while [[ $# -gt 0 ]]; do
     --output-format) OUTPUT_FORMAT="$2"; shift 2 ;;
     --compare) COMPARE=true; shift ;;
     --output-file) OUTPUT_FILE="$2"; shift 2 ;;
+    --jobs) JOBS="$2"; shift 2 ;;
     --help|-h)
       echo "Usage: $0 [OPTIONS]"
       echo ""
@@ -45,6 +47,7 @@ while [[ $# -gt 0 ]]; do
       echo "  --output-format FORMAT  markdown|json|terminal (default: markdown)"
       echo "  --compare               Enable period comparison"
       echo "  --output-file PATH      Output file path"
+      echo "  --jobs N                Workbooks parsed in parallel (default: 4)"
       exit 0
       ;;
     *) echo "Unknown option: $1"; exit 1 ;;
@@ -56,8 +59,19 @@ if [[ -z "$APPID" || -z "$DATE" ]]; then
   exit 1
 fi
 
+if [[ ! "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+  echo "Error: --jobs must be a positive integer"
+  exit 1
+fi
+
 echo -e "${BLUE}  📂 Loading data for ${APPID}/${DATE}/${ARCHITECTURE}${NC}"
 
+# Resolve the attachment parser once rather than failing per workbook
+HAVE_SUMMARIZE=false
+if command -v summarize &> /dev/null; then
+  HAVE_SUMMARIZE=true
+fi
+
 # Build cache path
 CACHE_PATH="${CACHE_DIR}/raw/${APPID}/${DATE}/${ARCHITECTURE}"
 REPORT_DIR="${CACHE_DIR}/reports/${APPID}/${DATE}/${ARCHITECTURE}"
@@ -76,28 +90,27 @@ if [[ ${#META_FILES[@]} -eq 0 ]]; then
   exit 0
 fi
 
-# Generate report content
-OUTPUT=""
+# Generate report content as an array of lines, printed once at the end
+OUTPUT=()
 
 if [[ "$OUTPUT_FORMAT" == "markdown" ]]; then
   # Get account display name
   DISPLAY_NAME="${ACCOUNT_NAME:-$APPID}"
   if [[ -f "${CACHE_DIR}/accounts.json" ]]; then
-    MAPPED_NAME=$(jq -r ".[\"${APPID}\"] // empty" "${CACHE_DIR}/accounts.json" 2>/dev/null)
+    MAPPED_NAME=$(jq -r --arg id "$APPID" '.[$id] // empty' "${CACHE_DIR}/accounts.json" 2>/dev/null)
     [[ -n "$MAPPED_NAME" ]] && DISPLAY_NAME="$MAPPED_NAME"
   fi
   
-  OUTPUT="## 账号: ${DISPLAY_NAME} (${APPID})\n\n"
+  OUTPUT=("## 账号: ${DISPLAY_NAME} (${APPID})" "")
   
   if [[ "$ARCHITECTURE" != "default" ]]; then
-    OUTPUT+="### 架构图: ${ARCHITECTURE}\n\n"
+    OUTPUT+=("### 架构图: ${ARCHITECTURE}" "")
   fi
   
-  # Process each report
-  for META_FILE in "${META_FILES[@]}"; do
-    REPORT_TYPE=$(jq -r '.reportType // "unknown"' "$META_FILE")
-    EVAL_TIME=$(jq -r '.date + " " + (.timestamp // "")' "$META_FILE" 2>/dev/null | cut -d' ' -f1-2)
-    
+  # Process each report; one jq pass reads the fields of every meta file,
+  # captured first so set -e still aborts on a malformed meta file
+  META_ROWS=$(jq -r '[.reportType // "unknown", (.date + " " + (.timestamp // "") | split(" ")[0:2] | join(" "))] | @tsv' "${META_FILES[@]}")
+  while IFS=$'\t' read -r REPORT_TYPE EVAL_TIME; do
     # Map report type to display name
     case "$REPORT_TYPE" in
       risk) TYPE_NAME="🔴 架构风险治理报告" ;;
@@ -107,85 +120,125 @@ if [[ "$OUTPUT_FORMAT" == "markdown" ]]; then
       *) TYPE_NAME="📄 $REPORT_TYPE" ;;
     esac
     
-    OUTPUT+="**报告类型**: ${TYPE_NAME}\n\n"
-    [[ -n "$EVAL_TIME" ]] && OUTPUT+="**评估时间**: ${EVAL_TIME}\n\n"
-    
-    # Look for attachments
-    ATTACH_DIR="$(dirname "$META_FILE")/attachments"
-    if [[ -d "$ATTACH_DIR" ]]; then
-      # Process Excel files with summarize
-      for XLSX in "$ATTACH_DIR"/*.xlsx; do
-        [[ -f "$XLSX" ]] || continue
-        echo -e "${BLUE}  📊 Parsing: $(basename "$XLSX")${NC}"
-        
-        OUTPUT+="### 📊 数据概览\n\n"
-        OUTPUT+="\`\`\`json\n"
-        
-        # Use summarize to extract content (required dependency)
-        SUMMARIZE_OUTPUT=$(summarize "$XLSX" --json 2>/dev/null | head -c 2000 || echo "{}")
-        OUTPUT+="${SUMMARIZE_OUTPUT}"
-        OUTPUT+="\n\`\`\`\n\n"
-      done
-      
-      # List PDFs if any
-      for PDF in "$ATTACH_DIR"/*.pdf; do
-        [[ -f "$PDF" ]] || continue
-        OUTPUT+="📎 附件: $(basename "$PDF")\n\n"
+    OUTPUT+=("**报告类型**: ${TYPE_NAME}" "")
+    [[ -n "$EVAL_TIME" ]] && OUTPUT+=("**评估时间**: ${EVAL_TIME}" "")
+  done <<< "$META_ROWS"
+  
+  # Attachments are shared by every report cached for this architecture,
+  # so parse each workbook once instead of once per report
+  ATTACH_DIR="${CACHE_PATH}/attachments"
+  if [[ -d "$ATTACH_DIR" ]]; then
+    # Parse uncached workbooks concurrently, up to $JOBS at a time; each job
+    # writes its own cache file, renamed into place only when summarize
+    # succeeded with output, so a failed or interrupted parse is retried
+    # on the next run
+    PARSE_PIDS=()
+    PARSE_WAITED=0
+    for XLSX in "$ATTACH_DIR"/*.xlsx; do
+      [[ -f "$XLSX" ]] || continue
+      SUMMARY_CACHE="${REPORT_DIR}/$(basename "$XLSX").summary.json"
+      if [[ -f "$SUMMARY_CACHE" && "$SUMMARY_CACHE" -nt "$XLSX" ]]; then
+        echo -e "${BLUE}  📊 Cached: $(basename "$XLSX")${NC}"
+        continue
+      fi
+      if [[ "$HAVE_SUMMARIZE" == false ]]; then
+        echo -e "${YELLOW}  ⚠️ summarize not installed, skipping: $(basename "$XLSX")${NC}"
+        continue
+      fi
+      # Throttle: wait for the oldest running parse (bash 3 has no wait -n)
+      while [[ $((${#PARSE_PIDS[@]} - PARSE_WAITED)) -ge $JOBS ]]; do
+        wait "${PARSE_PIDS[$PARSE_WAITED]}" || true
+        PARSE_WAITED=$((PARSE_WAITED + 1))
       done
-    fi
-  done
+      echo -e "${BLUE}  📊 Parsing: $(basename "$XLSX")${NC}"
+      # Use summarize to extract content (required dependency)
+      {
+        summarize "$XLSX" --json 2>/dev/null | head -c 2000 > "${SUMMARY_CACHE}.tmp"
+        # 141 (SIGPIPE) only means head already had its 2000 bytes
+        SUMMARIZE_STATUS=${PIPESTATUS[0]}
+        if [[ ( $SUMMARIZE_STATUS -eq 0 || $SUMMARIZE_STATUS -eq 141 ) && -s "${SUMMARY_CACHE}.tmp" ]]; then
+          mv "${SUMMARY_CACHE}.tmp" "$SUMMARY_CACHE"
+        else
+          rm -f "${SUMMARY_CACHE}.tmp"
+        fi
+      } &
+      PARSE_PIDS+=($!)
+    done
+    wait
+    
+    # Assemble summaries in attachment order
+    for XLSX in "$ATTACH_DIR"/*.xlsx; do
+      [[ -f "$XLSX" ]] || continue
+      SUMMARY_CACHE="${REPORT_DIR}/$(basename "$XLSX").summary.json"
+      OUTPUT+=("### 📊 数据概览" "" "\`\`\`json")
+      if [[ -f "$SUMMARY_CACHE" ]]; then
+        OUTPUT+=("$(< "$SUMMARY_CACHE")")
+      else
+        OUTPUT+=("{}")
+      fi
+      OUTPUT+=("\`\`\`" "")
+    done
+    
+    # List PDFs if any
+    for PDF in "$ATTACH_DIR"/*.pdf; do
+      [[ -f "$PDF" ]] || continue
+      OUTPUT+=("📎 附件: $(basename "$PDF")" "")
+    done
+  fi
   
   # Period comparison
   if [[ "$COMPARE" == true ]]; then
-    # Find previous date
+    # Find previous date: the latest cached date other than this one
     RAW_DIR="${CACHE_DIR}/raw/${APPID}"
-    PREV_DATE=$(find "$RAW_DIR" -mindepth 1 -maxdepth 1 -type d -exec basename {} \; 2>/dev/null | grep -v "$DATE" | sort -r | head -1)
+    PREV_DATE=""
+    for DATE_DIR in "$RAW_DIR"/*/; do
+      [[ -d "$DATE_DIR" ]] || continue
+      DATE_DIR="${DATE_DIR%/}"
+      DATE_DIR="${DATE_DIR##*/}"
+      if [[ "$DATE_DIR" != "$DATE" && "$DATE_DIR" > "$PREV_DATE" ]]; then
+        PREV_DATE="$DATE_DIR"
+      fi
+    done
     
     if [[ -n "$PREV_DATE" ]]; then
       echo -e "${BLUE}  📊 Comparing with ${PREV_DATE}${NC}"
-      OUTPUT+="### 📈 趋势对比\n\n"
-      OUTPUT+="> 对比上期: ${PREV_DATE}\n\n"
-      OUTPUT+="- 上期数据已缓存，可供对比\n\n"
+      OUTPUT+=("### 📈 趋势对比" "")
+      OUTPUT+=("> 对比上期: ${PREV_DATE}" "")
+      OUTPUT+=("- 上期数据已缓存，可供对比" "")
     else
       echo -e "${YELLOW}  ℹ️  No previous data for comparison${NC}"
     fi
   fi
-  
+
+  # Markdown reports end with an extra blank line
+  OUTPUT+=("")
+
 elif [[ "$OUTPUT_FORMAT" == "json" ]]; then
-  # Build JSON output
-  JSON_OBJ="{"
-  JSON_OBJ+="\"appid\":\"${APPID}\","
-  JSON_OBJ+="\"date\":\"${DATE}\","
-  JSON_OBJ+="\"architecture\":\"${ARCHITECTURE}\","
-  JSON_OBJ+="\"reports\":["
-  
-  FIRST=true
-  for META_FILE in "${META_FILES[@]}"; do
-    [[ "$FIRST" == true ]] || JSON_OBJ+=","
-    FIRST=false
-    META_JSON=$(cat "$META_FILE" | tr '\n' ' ')
-    JSON_OBJ+="${META_JSON}"
-  done
-  
-  JSON_OBJ+="]}"
-  OUTPUT="$JSON_OBJ"
+  # Build JSON output in one jq pass over every meta file
+  OUTPUT=("$(jq -cs \
+    --arg appid "$APPID" \
+    --arg date "$DATE" \
+    --arg architecture "$ARCHITECTURE" \
+    '{appid: $appid, date: $date, architecture: $architecture, reports: .}' \
+    "${META_FILES[@]}")")
   
 else
   # Terminal format
-  OUTPUT="账号: ${APPID} | 架构: ${ARCHITECTURE}"
+  OUTPUT=("账号: ${APPID} | 架构: ${ARCHITECTURE}")
 fi
 
 # Output
 if [[ -n "$OUTPUT_FILE" ]]; then
-  echo -e "$OUTPUT" > "$OUTPUT_FILE"
+  printf '%s\n' "${OUTPUT[@]}" > "$OUTPUT_FILE"
   echo -e "${GREEN}  ✅ Saved to ${OUTPUT_FILE}${NC}"
 else
-  echo -e "\n${OUTPUT}"
+  echo ""
+  printf '%s\n' "${OUTPUT[@]}"
 fi
 
 # Also save to reports directory
 REPORT_FILE="${REPORT_DIR}/report.${OUTPUT_FORMAT}"
-echo -e "$OUTPUT" > "$REPORT_FILE"
+printf '%s\n' "${OUTPUT[@]}" > "$REPORT_FILE"
 
 echo -e "${GREEN}  ✅ Report saved to ${REPORT_FILE}${NC}"
 exit 0
@@ -0,0 +1,33 @@
+#!/bin/bash
+#
+# accounts.sh - Shared account name mapping helpers (sourced, not executed)
+# Usage: source "${SCRIPT_DIR}/lib/accounts.sh"; load_account_names "$ACCOUNTS_FILE"
+#
+
+# APPID -> display name as parallel lists, filled once by load_account_names
+# (indexed arrays rather than an associative array so bash 3 works too)
+ACCOUNT_IDS=()
+ACCOUNT_NAMES=()
+
+# Load accounts.json into ACCOUNT_IDS/ACCOUNT_NAMES in a single jq pass.
+# Pairs are NUL-delimited so names keep backslashes, tabs and newlines verbatim.
+load_account_names() {
+  local accounts_file="$1" mapped_id mapped_name
+  [[ -f "$accounts_file" ]] || return 0
+  while IFS= read -r -d '' mapped_id && IFS= read -r -d '' mapped_name; do
+    ACCOUNT_IDS+=("$mapped_id")
+    ACCOUNT_NAMES+=("$mapped_name")
+  done < <(jq -j 'to_entries[] | "\(.key)\u0000\(.value)\u0000"' "$accounts_file" 2>/dev/null)
+}
+
+# Set ACCOUNT_NAME to the mapped name of APPID $1, or empty if unmapped
+lookup_account_name() {
+  local i
+  ACCOUNT_NAME=""
+  for ((i = 0; i < ${#ACCOUNT_IDS[@]}; i++)); do
+    if [[ "${ACCOUNT_IDS[$i]}" == "$1" ]]; then
+      ACCOUNT_NAME="${ACCOUNT_NAMES[$i]}"
+      return 0
+    fi
+  done
+}